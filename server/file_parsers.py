@@ -1,17 +1,39 @@
 from __future__ import annotations
 
+import importlib
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Callable, Dict, Iterator, List, Tuple
+from xml.etree.ElementTree import ParseError, iterparse
 from zipfile import ZipFile
 
 from pypdf import PdfReader
 
+_PDF_BACKEND_MODULES = {"pypdfium2": "pypdfium2", "pymupdf": "fitz"}
+
+_MAX_PARSE_WORKERS = 8
+_PAGE_CACHE_SIZE = 64
+
+_CR_RE = re.compile(r"\r+")
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+_SLIDE_NAME_RE = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+_A_T_TAG = "{http://schemas.openxmlformats.org/drawingml/2006/main}t"
+
 
 def normalize_text(text: str) -> str:
-    cleaned = (text or "").replace("\x00", " ")
-    cleaned = re.sub(r"\r+", "\n", cleaned)
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    # Substring probes are far cheaper than a regex scan, so only run the
+    # passes that can actually change something.
+    cleaned = text or ""
+    if "\x00" in cleaned:
+        cleaned = cleaned.replace("\x00", " ")
+    if "\r" in cleaned:
+        cleaned = _CR_RE.sub("\n", cleaned)
+    if "\n\n\n" in cleaned:
+        cleaned = _MULTI_NL_RE.sub("\n\n", cleaned)
     return cleaned.strip()
 
 
@@ -26,43 +48,138 @@ def extract_text_from_pptx(file_path: Path) -> str:
 
 
 def extract_pdf_pages(file_path: Path) -> List[Dict[str, str]]:
-    reader = PdfReader(str(file_path))
+    return _load_pages(file_path, _parse_pdf_pages)
+
+
+def extract_pptx_slides(file_path: Path) -> List[Dict[str, str]]:
+    return _load_pages(file_path, _parse_pptx_slides)
+
+
+def _load_pages(file_path: Path, parser: Callable[[Path], List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """Share one parse per file revision between the quiz and learning-note endpoints."""
+    stat = file_path.stat()
+    pages = _parse_pages_cached(parser, str(file_path), stat.st_mtime_ns, stat.st_size)
+    return [dict(page) for page in pages]
+
+
+@lru_cache(maxsize=_PAGE_CACHE_SIZE)
+def _parse_pages_cached(
+    parser: Callable[[Path], List[Dict[str, str]]], path_str: str, mtime_ns: int, size: int
+) -> Tuple[Dict[str, str], ...]:
+    return tuple(parser(Path(path_str)))
+
+
+def _parse_pdf_pages(file_path: Path) -> List[Dict[str, str]]:
     pages: List[Dict[str, str]] = []
-    for idx, page in enumerate(reader.pages, start=1):
-        try:
-            page_text = page.extract_text() or ""
-        except Exception:  # pragma: no cover - best effort extraction
-            page_text = ""
+    for idx, page_text in enumerate(_iter_pdf_page_texts(file_path), start=1):
         normalized = normalize_text(page_text)
         pages.append({"index": idx, "label": f"Page {idx}", "text": normalized})
     return pages
 
 
-def extract_pptx_slides(file_path: Path) -> List[Dict[str, str]]:
-    slides: List[Dict[str, str]] = []
+@lru_cache(maxsize=1)
+def _pdf_backend() -> str:
+    """Pick the fastest installed PDF backend, honouring ``PDF_BACKEND`` first."""
+    # Read lazily so a value loaded from .env after import is still honoured.
+    preferred = os.getenv("PDF_BACKEND", "pypdfium2").strip().lower()
+    if preferred == "pypdf":
+        return "pypdf"
+    for name in (preferred, "pypdfium2", "pymupdf"):
+        module = _PDF_BACKEND_MODULES.get(name)
+        if not module:
+            continue
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        return name
+    return "pypdf"
+
+
+def _iter_pdf_page_texts(file_path: Path) -> Iterator[str]:
+    backend = _pdf_backend()
+    if backend == "pypdfium2":
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            for page in pdf:
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        page_text = textpage.get_text_range()
+                    finally:
+                        textpage.close()
+                except Exception:  # pragma: no cover - best effort extraction
+                    page_text = ""
+                finally:
+                    page.close()
+                yield page_text.replace("\r\n", "\n")
+        finally:
+            pdf.close()
+    elif backend == "pymupdf":
+        import fitz
+
+        with fitz.open(file_path) as doc:
+            for page in doc:
+                try:
+                    page_text = page.get_text("text")
+                except Exception:  # pragma: no cover - best effort extraction
+                    page_text = ""
+                yield page_text
+    else:
+        reader = PdfReader(str(file_path))
+        for page in reader.pages:
+            try:
+                page_text = page.extract_text() or ""
+            except Exception:  # pragma: no cover - best effort extraction
+                page_text = ""
+            yield page_text
+
+
+def _parse_pptx_slides(file_path: Path) -> List[Dict[str, str]]:
     with ZipFile(file_path) as archive:
-        slide_files = sorted(
-            name
+        numbered = [
+            (int(match.group(1)), name)
             for name in archive.namelist()
-            if name.startswith("ppt/slides/slide") and name.endswith(".xml")
-        )
-        for idx, name in enumerate(slide_files, start=1):
-            xml_bytes = archive.read(name)
-            text_nodes = list(_extract_text_nodes(xml_bytes.decode("utf-8", errors="ignore")))
-            normalized = normalize_text("\n".join(text_nodes))
-            slides.append({"index": idx, "label": f"Slide {idx}", "text": normalized})
-    return slides
-
-
-def _extract_text_nodes(xml_text: str) -> Iterable[str]:
-    pattern = re.compile(r"<a:t[^>]*>(.*?)</a:t>", re.DOTALL)
-    for match in pattern.finditer(xml_text):
-        fragment = match.group(1)
-        fragment = (
-            fragment.replace("&amp;", "&")
-            .replace("&lt;", "<")
-            .replace("&gt;", ">")
-            .replace("&quot;", '"')
-            .replace("&apos;", "'")
-        )
-        yield fragment
+            if (match := _SLIDE_NAME_RE.match(name))
+        ]
+    slide_files = [name for _, name in sorted(numbered)]
+    if not slide_files:
+        return []
+
+    # ZipFile.open/close bookkeeping is not thread-safe, so every worker thread
+    # opens its own handle on the archive instead of sharing one.
+    local = threading.local()
+    archives: List[ZipFile] = []
+
+    def _read_slide(name: str) -> str:
+        archive = getattr(local, "archive", None)
+        if archive is None:
+            archive = local.archive = ZipFile(file_path)
+            archives.append(archive)
+        # The member is inflated lazily while iterparse consumes it, and
+        # finished elements are cleared as we go.
+        text_nodes: List[str] = []
+        try:
+            with archive.open(name) as stream:
+                for _, elem in iterparse(stream):
+                    if elem.tag == _A_T_TAG and elem.text:
+                        text_nodes.append(elem.text)
+                    elem.clear()
+        except ParseError:  # pragma: no cover - best effort extraction
+            pass
+        return normalize_text("\n".join(text_nodes))
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(_MAX_PARSE_WORKERS, len(slide_files))) as executor:
+            texts = list(executor.map(_read_slide, slide_files))
+    finally:
+        for archive in archives:
+            archive.close()
+
+    return [
+        {"index": idx, "label": f"Slide {idx}", "text": text}
+        for idx, text in enumerate(texts, start=1)
+    ]
+
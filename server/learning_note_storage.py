@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import json
+import contextlib
 import os
 import tempfile
 from pathlib import Path
 from threading import Lock
 from typing import Any, Dict, Optional
 
+import orjson
+
 
 class LearningNoteStorage:
     """Persist per-file learning notes as standalone JSON documents."""
@@ -25,20 +27,27 @@ class LearningNoteStorage:
         if not path.exists():
             return None
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            return orjson.loads(path.read_bytes())
+        except (orjson.JSONDecodeError, OSError):
             return None
 
     def write(self, file_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         path = self._path_for(file_id)
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
         tmp_fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f"{path.stem}_", suffix=".tmp")
         try:
-            with os.fdopen(tmp_fd, "w", encoding="utf-8") as handle:
-                json.dump(payload, handle, ensure_ascii=False, indent=2)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(tmp_fd, view) :]
+                os.fsync(tmp_fd)
+            finally:
+                os.close(tmp_fd)
             os.replace(tmp_path, path)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
         return payload
 
     def save(self, file_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,21 +1,39 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
+import logging
 import os
+import random
+import re
 import time
 from datetime import datetime, timezone
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
+import aiofiles
 import google.generativeai as genai
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from google.api_core.exceptions import GoogleAPICallError, ResourceExhausted
 from pydantic import BaseModel, Field
 
 from file_parsers import (
@@ -26,10 +44,15 @@ from file_parsers import (
     normalize_text,
 )
 from learning_note_storage import LearningNoteStorage
+from prompt_cache import PromptCache
 from quiz_storage import QuizStorage
+from rate_limiter import AsyncTokenBucket
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
 BASE_DIR = Path(__file__).resolve().parent
 ROOT_DIR = BASE_DIR.parent
 PREVIEW_DIR = ROOT_DIR / "preview"
@@ -37,6 +60,8 @@ UPLOAD_DIR = BASE_DIR / "upload"
 DATA_DIR = BASE_DIR / "data"
 QUIZ_STORE_PATH = DATA_DIR / "quizzes.json"
 LEARNING_NOTE_DIR = DATA_DIR / "notes"
+PROMPT_CACHE_DIR = DATA_DIR / "prompt_cache"
+PROMPT_CACHE_MAX_ENTRIES = 5000
 
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -46,9 +71,21 @@ learning_note_storage = LearningNoteStorage(LEARNING_NOTE_DIR)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+prompt_cache = PromptCache(PROMPT_CACHE_DIR, GEMINI_MODEL, max_entries=PROMPT_CACHE_MAX_ENTRIES)
 MAX_SOURCE_CHARS = 8000
 MAX_PAGE_PROMPT_CHARS = 3500
 MAX_PAGE_TEXT_CHARS = 6000
+UPLOAD_CHUNK_BYTES = 4 * 1024 * 1024
+GEMINI_CONCURRENCY = max(1, int(os.getenv("GEMINI_CONCURRENCY", "8")))
+GEMINI_RPS = max(1, int(os.getenv("GEMINI_RPS", "10")))
+GEMINI_BURST = 20
+GEMINI_MAX_RETRIES = 4
+GEMINI_BACKOFF_BASE = 1.0
+GEMINI_BACKOFF_MAX = 30.0
+
+_FILE_ID_RE = re.compile(r"^\d+_[0-9a-f]{8}\.[A-Za-z0-9]{1,8}$")
+
+_gemini_limits_state: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore, AsyncTokenBucket]] = None
 
 
 @lru_cache(maxsize=1)
@@ -60,20 +97,71 @@ def _get_model() -> genai.GenerativeModel:
 
 
 async def generate_with_gemini(prompt: str) -> str:
-    def _request() -> str:
-        model = _get_model()
-        response = model.generate_content(prompt)
-        text = getattr(response, "text", None)
-        if not text:
-            raise RuntimeError("AI 응답에 텍스트가 없습니다.")
-        return text
+    raw = await _request_with_backoff(prompt)
+    return raw.replace("```json", "").replace("```", "").strip()
 
-    try:
-        raw = await run_in_threadpool(_request)
-    except Exception as exc:  # pragma: no cover - relies on remote service
-        raise HTTPException(status_code=500, detail=f"Gemini 호출 실패: {exc}") from exc
 
-    return raw.replace("```json", "").replace("```", "").strip()
+async def _generate_parsed(prompt: str, parse: Callable[[str], T], *, use_cache: bool = False) -> T:
+    # Only responses that parse are cached, so one malformed reply cannot be
+    # replayed on every later request for the same prompt. Cache file I/O (and
+    # the periodic prune inside set) runs in the threadpool, off the event loop.
+    if use_cache:
+        cached = await run_in_threadpool(prompt_cache.get, prompt)
+        if cached is not None:
+            try:
+                return parse(cached)
+            except HTTPException:
+                pass
+    raw = await generate_with_gemini(prompt)
+    result = parse(raw)
+    if use_cache:
+        await run_in_threadpool(prompt_cache.set, prompt, raw)
+    return result
+
+
+async def _request_gemini(prompt: str) -> str:
+    model = _get_model()
+    response = await model.generate_content_async(prompt)
+    text = getattr(response, "text", None)
+    if not text:
+        raise RuntimeError("AI 응답에 텍스트가 없습니다.")
+    return text
+
+
+def _gemini_limits() -> Tuple[asyncio.Semaphore, AsyncTokenBucket]:
+    # asyncio primitives bind to the first loop that waits on them, so build
+    # them lazily on the running loop and rebuild them if the loop changes.
+    global _gemini_limits_state
+    loop = asyncio.get_running_loop()
+    if _gemini_limits_state is None or _gemini_limits_state[0] is not loop:
+        _gemini_limits_state = (
+            loop,
+            asyncio.Semaphore(GEMINI_CONCURRENCY),
+            AsyncTokenBucket(rate=GEMINI_RPS, capacity=GEMINI_BURST),
+        )
+    return _gemini_limits_state[1], _gemini_limits_state[2]
+
+
+async def _request_with_backoff(prompt: str) -> str:
+    semaphore, bucket = _gemini_limits()
+    attempt = 0
+    while True:
+        await bucket.acquire()
+        try:
+            async with semaphore:
+                return await _request_gemini(prompt)
+        except ResourceExhausted as exc:  # pragma: no cover - relies on remote service
+            if attempt >= GEMINI_MAX_RETRIES:
+                raise HTTPException(status_code=500, detail=f"Gemini 호출 실패: {exc}") from exc
+            delay = min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2**attempt)
+            delay += random.uniform(0, GEMINI_BACKOFF_BASE)
+            logger.warning("Gemini rate limited (attempt %d), retrying in %.1fs", attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+        except GoogleAPICallError as exc:  # pragma: no cover - relies on remote service
+            raise HTTPException(status_code=500, detail=f"Gemini 호출 실패: {exc.message}") from exc
+        except Exception as exc:  # pragma: no cover - relies on remote service
+            raise HTTPException(status_code=500, detail=f"Gemini 호출 실패: {exc}") from exc
 
 
 class QuizFromTextRequest(BaseModel):
@@ -129,12 +217,9 @@ async def upload_file(file: UploadFile = File(...)) -> Dict[str, Any]:
     unique_name = f"{int(time.time() * 1000)}_{os.urandom(4).hex()}{extension}"
     destination = UPLOAD_DIR / unique_name
 
-    with destination.open("wb") as buffer:
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
-            buffer.write(chunk)
+    async with aiofiles.open(destination, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            await buffer.write(chunk)
 
     return {"ok": True, "fileId": unique_name, "originalName": file.filename}
 
@@ -168,9 +253,7 @@ async def generate_quiz_from_text(payload: QuizFromTextRequest) -> Dict[str, Any
 
 @app.post("/api/generate-quiz-from-file")
 async def generate_quiz_from_file(payload: QuizFromFileRequest) -> Dict[str, Any]:
-    file_path = (UPLOAD_DIR / payload.fileId).resolve()
-    if not str(file_path).startswith(str(UPLOAD_DIR.resolve())) or not file_path.exists():
-        raise HTTPException(status_code=404, detail="업로드된 파일을 찾을 수 없습니다.")
+    file_path = _resolve_upload(payload.fileId)
 
     ext = file_path.suffix.lower()
     if ext == ".pdf":
@@ -207,50 +290,42 @@ async def generate_learning_note(payload: LearningNoteRequest) -> Dict[str, Any]
     if existing and not payload.force:
         return existing
 
-    file_path = (UPLOAD_DIR / payload.fileId).resolve()
-    if not str(file_path).startswith(str(UPLOAD_DIR.resolve())) or not file_path.exists():
-        raise HTTPException(status_code=404, detail="업로드된 파일을 찾을 수 없습니다.")
-
-    chunks = _extract_page_chunks(file_path)
-    if not chunks:
-        raise HTTPException(status_code=400, detail="문서에서 요약할 페이지를 찾을 수 없습니다.")
-
-    pages = []
-    for chunk in chunks:
-        text = chunk.get("text", "").strip()
-        if not text:
-            continue
-        summary = await _summarize_single_page(chunk["label"], text[:MAX_PAGE_PROMPT_CHARS])
-        pages.append(
-            {
-                "index": chunk["index"],
-                "label": chunk["label"],
-                "text": _clip_text(text, MAX_PAGE_TEXT_CHARS),
-                "summary": summary,
-            }
-        )
-
-    if not pages:
-        raise HTTPException(status_code=400, detail="요약 가능한 페이지 내용이 없습니다.")
-
-    windows = await _summarize_windows(pages, payload.windowSize)
-    merged_md = _merge_markdown(windows)
-    now = datetime.now(timezone.utc).isoformat()
-    created_at = (existing or {}).get("createdAt")
-    record = {
-        "fileId": payload.fileId,
-        "createdAt": created_at or now,
-        "updatedAt": now,
-        "pageCount": len(pages),
-        "windowSize": payload.windowSize,
-        "pages": pages,
-        "windows": windows,
-        "markdown": merged_md,
-    }
+    page_chunks = _load_page_chunks(payload.fileId)
+    use_cache = not payload.force
+    # Repeated slides (agenda, section dividers) share a single Gemini call.
+    chunks_by_text = _group_by_prompt_text(page_chunks)
+    unique_summaries = await _gather_or_cancel(
+        _summarize_single_page(group[0][0]["label"], prompt_text, use_cache=use_cache)
+        for prompt_text, group in chunks_by_text.items()
+    )
+    summaries_by_text = dict(zip(chunks_by_text, unique_summaries))
+    pages = [
+        _page_entry(chunk, text, summaries_by_text[text[:MAX_PAGE_PROMPT_CHARS]])
+        for chunk, text in page_chunks
+    ]
+
+    windows = await _summarize_windows(pages, payload.windowSize, use_cache=use_cache)
+    record = _build_note_record(payload, existing, pages, windows)
     learning_note_storage.save(payload.fileId, record)
     return record
 
 
+@app.post("/api/generate-learning-note/stream")
+async def stream_learning_note(payload: LearningNoteRequest) -> StreamingResponse:
+    existing = learning_note_storage.read(payload.fileId)
+    if existing and not payload.force:
+        events = _single_event("note", existing)
+    else:
+        # Validate before the stream opens so failures still map to HTTP status codes.
+        page_chunks = _load_page_chunks(payload.fileId)
+        events = _stream_learning_note(payload, existing, page_chunks)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/learning-note/{file_id}")
 async def get_learning_note(file_id: str) -> Dict[str, Any]:
     record = learning_note_storage.read(file_id)
@@ -259,8 +334,7 @@ async def get_learning_note(file_id: str) -> Dict[str, Any]:
     return record
 
 
-def _build_text_prompt(source: str, num_questions: int, difficulty: str) -> str:
-    return f"""
+_TEXT_PROMPT_TMPL = """
 당신은 대학 전공 학습용 객관식 퀴즈 출제 도우미입니다.
 주어진 학습 노트를 바탕으로 고품질 퀴즈를 만들어 주세요.
 
@@ -296,8 +370,17 @@ JSON 스키마:
 """.strip()
 
 
-def _build_file_prompt(source: str, num_questions: int) -> str:
-    return f"""
+def _build_text_prompt(source: str, num_questions: int, difficulty: str) -> str:
+    return _TEXT_PROMPT_TMPL.format_map(
+        {
+            "num_questions": num_questions,
+            "difficulty": difficulty,
+            "source": source.rstrip(),
+        }
+    )
+
+
+_FILE_PROMPT_TMPL = """
 대학 강의 자료에서 핵심 개념을 뽑아 객관식 퀴즈를 만드세요.
 
 조건:
@@ -332,10 +415,19 @@ JSON 예시 구조:
 """.strip()
 
 
+def _build_file_prompt(source: str, num_questions: int) -> str:
+    return _FILE_PROMPT_TMPL.format_map(
+        {
+            "num_questions": num_questions,
+            "source": source.rstrip(),
+        }
+    )
+
+
 def _parse_quiz_payload(raw: str) -> Dict[str, Any]:
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as exc:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
         raise HTTPException(status_code=500, detail={"error": "JSON 파싱 실패", "raw": raw}) from exc
 
     if isinstance(data, dict) and isinstance(data.get("questions"), list):
@@ -381,14 +473,12 @@ def _parse_quiz_payload(raw: str) -> Dict[str, Any]:
     return {"questions": questions, "notes": notes_raw}
 
 
-async def _summarize_single_page(label: str, text: str) -> Dict[str, Any]:
+async def _summarize_single_page(label: str, text: str, *, use_cache: bool = False) -> Dict[str, Any]:
     prompt = _build_page_summary_prompt(label, text)
-    raw = await generate_with_gemini(prompt)
-    return _parse_page_summary(raw)
+    return await _generate_parsed(prompt, _parse_page_summary, use_cache=use_cache)
 
 
-def _build_page_summary_prompt(label: str, text: str) -> str:
-    return f"""
+_PAGE_SUMMARY_PROMPT_TMPL = """
 당신은 대학 강의 슬라이드를 요약하는 조교입니다. 주어진 페이지 내용을 바탕으로 구체적 개요를 출력하세요.
 
 출력 형식(JSON만 허용):
@@ -410,10 +500,19 @@ def _build_page_summary_prompt(label: str, text: str) -> str:
 """.strip()
 
 
+def _build_page_summary_prompt(label: str, text: str) -> str:
+    return _PAGE_SUMMARY_PROMPT_TMPL.format_map(
+        {
+            "label": label,
+            "text": text.rstrip(),
+        }
+    )
+
+
 def _parse_page_summary(raw: str) -> Dict[str, Any]:
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as exc:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
         raise HTTPException(status_code=500, detail={"error": "페이지 요약 JSON 파싱 실패", "raw": raw}) from exc
 
     outline = str(data.get("outline") or data.get("summary") or "").strip()
@@ -434,7 +533,22 @@ def _parse_page_summary(raw: str) -> Dict[str, Any]:
     }
 
 
-async def _summarize_windows(pages: Sequence[Dict[str, Any]], window_size: int) -> List[Dict[str, Any]]:
+async def _summarize_windows(
+    pages: Sequence[Dict[str, Any]], window_size: int, *, use_cache: bool = False
+) -> List[Dict[str, Any]]:
+    window_groups = _window_groups(pages, window_size)
+    markdowns = await _gather_or_cancel(
+        _summarize_window_block(window_pages, use_cache=use_cache) for window_pages in window_groups
+    )
+    windows = [
+        _window_entry(window_pages, markdown) for window_pages, markdown in zip(window_groups, markdowns)
+    ]
+
+    windows.sort(key=lambda item: item["startPage"])
+    return windows
+
+
+def _window_groups(pages: Sequence[Dict[str, Any]], window_size: int) -> List[List[Dict[str, Any]]]:
     if not pages:
         return []
 
@@ -442,36 +556,39 @@ async def _summarize_windows(pages: Sequence[Dict[str, Any]], window_size: int)
     left = clamped_size // 2
     right = clamped_size - left - 1
 
-    windows: List[Dict[str, Any]] = []
-    seen: set[Tuple[int, int]] = set()
-    for idx in range(len(pages)):
-        start = max(0, idx - left)
-        end = min(len(pages), idx + right + 1)
-        if end - start <= 0:
-            continue
-        key = (start, end)
-        if key in seen:
-            continue
-        seen.add(key)
-        window_pages = list(pages[start:end])
-        markdown = await _summarize_window_block(window_pages)
-        windows.append(
-            {
-                "startPage": window_pages[0]["index"],
-                "endPage": window_pages[-1]["index"],
-                "pageIndexes": [page["index"] for page in window_pages],
-                "markdown": markdown,
-            }
+    window_specs: List[Tuple[int, int]] = list(
+        dict.fromkeys(
+            (max(0, idx - left), min(len(pages), idx + right + 1)) for idx in range(len(pages))
         )
+    )
+    return [list(pages[start:end]) for start, end in window_specs]
 
-    windows.sort(key=lambda item: item["startPage"])
-    return windows
+
+def _window_entry(window_pages: Sequence[Dict[str, Any]], markdown: str) -> Dict[str, Any]:
+    return {
+        "startPage": window_pages[0]["index"],
+        "endPage": window_pages[-1]["index"],
+        "pageIndexes": [page["index"] for page in window_pages],
+        "markdown": markdown,
+    }
 
 
-async def _summarize_window_block(window_pages: Sequence[Dict[str, Any]]) -> str:
+async def _summarize_window_block(window_pages: Sequence[Dict[str, Any]], *, use_cache: bool = False) -> str:
     prompt = _build_window_prompt(window_pages)
-    raw = await generate_with_gemini(prompt)
-    return raw.strip()
+    return await _generate_parsed(prompt, str.strip, use_cache=use_cache)
+
+
+_WINDOW_PROMPT_HEADER = """
+연속된 학습 자료 페이지 요약을 입력으로 받습니다. 중복되는 설명을 통합하고 Markdown으로 정리하세요.
+
+규칙:
+- 각 섹션 제목은 `### Pages 시작-끝` 형식
+- 불릿마다 기여한 페이지를 괄호로 표기 (예: (p2,p3))
+- 앞뒤 페이지에서 이미 다룬 내용은 제거하거나 묶어서 하나의 bullet로
+- Markdown 이외 텍스트를 추가하지 마세요
+
+페이지 요약:
+"""[1:]
 
 
 def _build_window_prompt(window_pages: Sequence[Dict[str, Any]]) -> str:
@@ -486,19 +603,128 @@ def _build_window_prompt(window_pages: Sequence[Dict[str, Any]]) -> str:
             f"핵심:\n{bullet_text}\n"
             f"질문: {summary.get('studyQuestion', '')}"
         )
-    joined = "\n\n".join(parts)
-    return f"""
-연속된 학습 자료 페이지 요약을 입력으로 받습니다. 중복되는 설명을 통합하고 Markdown으로 정리하세요.
+    return _WINDOW_PROMPT_HEADER + "\n\n".join(parts).rstrip()
 
-규칙:
-- 각 섹션 제목은 `### Pages 시작-끝` 형식
-- 불릿마다 기여한 페이지를 괄호로 표기 (예: (p2,p3))
-- 앞뒤 페이지에서 이미 다룬 내용은 제거하거나 묶어서 하나의 bullet로
-- Markdown 이외 텍스트를 추가하지 마세요
 
-페이지 요약:
-{joined}
-""".strip()
+async def _stream_learning_note(
+    payload: LearningNoteRequest,
+    existing: Optional[Dict[str, Any]],
+    page_chunks: Sequence[Tuple[Dict[str, Any], str]],
+) -> AsyncIterator[str]:
+    use_cache = not payload.force
+    chunks_by_text = _group_by_prompt_text(page_chunks)
+
+    async def _summarize(prompt_text: str, label: str) -> Tuple[str, Dict[str, Any]]:
+        return prompt_text, await _summarize_single_page(label, prompt_text, use_cache=use_cache)
+
+    async def _summarize_window(window_pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        markdown = await _summarize_window_block(window_pages, use_cache=use_cache)
+        return _window_entry(window_pages, markdown)
+
+    try:
+        pages_by_index: Dict[int, Dict[str, Any]] = {}
+        page_jobs = (
+            _summarize(prompt_text, group[0][0]["label"])
+            for prompt_text, group in chunks_by_text.items()
+        )
+        async for prompt_text, summary in _iter_completed(page_jobs):
+            for chunk, text in chunks_by_text[prompt_text]:
+                page = _page_entry(chunk, text, summary)
+                pages_by_index[chunk["index"]] = page
+                yield _sse_event("page", page)
+        pages = [pages_by_index[chunk["index"]] for chunk, _ in page_chunks]
+
+        windows: List[Dict[str, Any]] = []
+        window_jobs = (_summarize_window(group) for group in _window_groups(pages, payload.windowSize))
+        async for window in _iter_completed(window_jobs):
+            windows.append(window)
+            yield _sse_event("window", window)
+        windows.sort(key=lambda item: item["startPage"])
+
+        record = _build_note_record(payload, existing, pages, windows)
+        learning_note_storage.save(payload.fileId, record)
+        yield _sse_event("note", record)
+    except HTTPException as exc:
+        yield _sse_event("error", {"detail": exc.detail})
+
+
+async def _gather_or_cancel(jobs: Iterable[Awaitable[Any]]) -> List[Any]:
+    # Unlike a bare gather, stop the remaining Gemini calls once one has failed.
+    tasks = [asyncio.ensure_future(job) for job in jobs]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _iter_completed(jobs: Iterable[Awaitable[Any]]) -> AsyncIterator[Any]:
+    tasks = [asyncio.ensure_future(job) for job in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _single_event(event: str, data: Any) -> AsyncIterator[str]:
+    yield _sse_event(event, data)
+
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode('utf-8')}\n\n"
+
+
+def _load_page_chunks(file_id: str) -> List[Tuple[Dict[str, Any], str]]:
+    file_path = _resolve_upload(file_id)
+
+    chunks = _extract_page_chunks(file_path)
+    if not chunks:
+        raise HTTPException(status_code=400, detail="문서에서 요약할 페이지를 찾을 수 없습니다.")
+
+    page_chunks = [(chunk, text) for chunk in chunks if (text := chunk.get("text", "").strip())]
+    if not page_chunks:
+        raise HTTPException(status_code=400, detail="요약 가능한 페이지 내용이 없습니다.")
+    return page_chunks
+
+
+def _group_by_prompt_text(
+    page_chunks: Sequence[Tuple[Dict[str, Any], str]]
+) -> Dict[str, List[Tuple[Dict[str, Any], str]]]:
+    chunks_by_text: Dict[str, List[Tuple[Dict[str, Any], str]]] = {}
+    for chunk, text in page_chunks:
+        chunks_by_text.setdefault(text[:MAX_PAGE_PROMPT_CHARS], []).append((chunk, text))
+    return chunks_by_text
+
+
+def _page_entry(chunk: Dict[str, Any], text: str, summary: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "index": chunk["index"],
+        "label": chunk["label"],
+        "text": _clip_text(text, MAX_PAGE_TEXT_CHARS),
+        "summary": summary,
+    }
+
+
+def _build_note_record(
+    payload: LearningNoteRequest,
+    existing: Optional[Dict[str, Any]],
+    pages: List[Dict[str, Any]],
+    windows: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc).isoformat()
+    created_at = (existing or {}).get("createdAt")
+    return {
+        "fileId": payload.fileId,
+        "createdAt": created_at or now,
+        "updatedAt": now,
+        "pageCount": len(pages),
+        "windowSize": payload.windowSize,
+        "pages": pages,
+        "windows": windows,
+        "markdown": _merge_markdown(windows),
+    }
 
 
 def _merge_markdown(windows: Sequence[Dict[str, Any]]) -> str:
@@ -513,6 +739,17 @@ def _clip_text(value: str, limit: int) -> str:
     return text[:limit].rstrip() + " …"
 
 
+def _resolve_upload(file_id: str) -> Path:
+    # fileIds are always minted by upload_file, so a strict pattern rules out
+    # path traversal without resolving symlinks on every request.
+    if not _FILE_ID_RE.fullmatch(file_id):
+        raise HTTPException(status_code=400, detail="잘못된 fileId 형식입니다.")
+    file_path = UPLOAD_DIR / file_id
+    if not file_path.is_file():
+        raise HTTPException(status_code=404, detail="업로드된 파일을 찾을 수 없습니다.")
+    return file_path
+
+
 def _extract_page_chunks(file_path: Path) -> List[Dict[str, Any]]:
     ext = file_path.suffix.lower()
     if ext == ".pdf":
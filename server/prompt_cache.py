@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+
+class PromptCache:
+    """Persist Gemini responses keyed by a hash of model name and prompt.
+
+    Entries are evicted least-recently-used once the directory holds more than
+    ``max_entries`` responses; hits refresh an entry's mtime.
+    """
+
+    _PRUNE_EVERY = 64
+
+    def __init__(self, root: Path, model: str, max_entries: int = 5000) -> None:
+        self.root = root
+        self.model = model
+        self.max_entries = max_entries
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+        self._lock = Lock()
+        self._prefix_hash = hashlib.sha256(f"{model}\0".encode("utf-8"))
+
+    def _path_for(self, prompt: str) -> Path:
+        hasher = self._prefix_hash.copy()
+        hasher.update(prompt.encode("utf-8"))
+        key = hasher.hexdigest()
+        return self.root / f"{key}.txt"
+
+    def get(self, prompt: str) -> Optional[str]:
+        path = self._path_for(prompt)
+        try:
+            response = path.read_text(encoding="utf-8")
+            os.utime(path)
+        except OSError:
+            return None
+        return response
+
+    def set(self, prompt: str, response: str) -> None:
+        path = self._path_for(prompt)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f"{path.stem}_", suffix=".tmp")
+        try:
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as handle:
+                handle.write(response)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._writes += 1
+            if self._writes % self._PRUNE_EVERY:
+                return
+        self._prune()
+
+    def _prune(self) -> None:
+        entries = []
+        for path in self.root.glob("*.txt"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()